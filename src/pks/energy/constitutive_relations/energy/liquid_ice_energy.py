@@ -1,8 +1,6 @@
 """Energy for a two-phase, liquid+ice evaluator."""
 
 import sys, os
-sys.path.append(os.path.join(os.environ['ATS_SRC_DIR'], "tools", "evaluator_generator"))
-from evaluator_generator import generate_evaluator
 
 deps = [("porosity", "phi"),
         ("base_porosity", "phi0"),
@@ -18,10 +16,15 @@ deps = [("porosity", "phi"),
         ]
 params = []
 
-import sympy
-phi, phi0, sl, nl, ul, si, ni, ui, rho_r, ur, cv = sympy.var("phi, phi0, sl, nl, ul, si, ni, ui, rho_r, ur, cv")
-expression = (phi*(sl*nl*ul + si*ni*ui) + (1-phi0)*rho_r*ur) * cv;
+if __name__ == "__main__":
+    # sympy and code generation are only needed when run as a script
+    sys.path.append(os.path.join(os.environ['ATS_SRC_DIR'], "tools", "evaluator_generator"))
+    from evaluator_generator import generate_evaluator
 
-generate_evaluator("liquid_ice_energy", "Energy",
-                   "liquid+ice energy", "energy",
-                   deps, params, expression=expression, doc=__doc__)
+    import sympy
+    phi, phi0, sl, nl, ul, si, ni, ui, rho_r, ur, cv = sympy.var("phi, phi0, sl, nl, ul, si, ni, ui, rho_r, ur, cv")
+    expression = (phi*(sl*nl*ul + si*ni*ui) + (1-phi0)*rho_r*ur) * cv;
+
+    generate_evaluator("liquid_ice_energy", "Energy",
+                       "liquid+ice energy", "energy",
+                       deps, params, expression=expression, doc=__doc__)
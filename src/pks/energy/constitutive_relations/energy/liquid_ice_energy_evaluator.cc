@@ -144,7 +144,8 @@ Teuchos::RCP<const CompositeVector> cv = S->GetFieldData(cv_key_);
     Epetra_MultiVector& result_v = *result->ViewComponent(*comp,false);
 
     int ncomp = result->size(*comp, false);
-    for (int i=0; i!=ncomp; ++i) {
+    #pragma omp simd
+    for (int i=0; i<ncomp; ++i) {
       result_v[0][i] = model_->Energy(phi_v[0][i], phi0_v[0][i], sl_v[0][i], nl_v[0][i], ul_v[0][i], si_v[0][i], ni_v[0][i], ui_v[0][i], rho_r_v[0][i], ur_v[0][i], cv_v[0][i]);
     }
   }
@@ -184,7 +185,8 @@ Teuchos::RCP<const CompositeVector> cv = S->GetFieldData(cv_key_);
       Epetra_MultiVector& result_v = *result->ViewComponent(*comp,false);
 
       int ncomp = result->size(*comp, false);
-      for (int i=0; i!=ncomp; ++i) {
+      #pragma omp simd
+      for (int i=0; i<ncomp; ++i) {
         result_v[0][i] = model_->DEnergyDPorosity(phi_v[0][i], phi0_v[0][i], sl_v[0][i], nl_v[0][i], ul_v[0][i], si_v[0][i], ni_v[0][i], ui_v[0][i], rho_r_v[0][i], ur_v[0][i], cv_v[0][i]);
       }
     }
@@ -206,7 +208,8 @@ Teuchos::RCP<const CompositeVector> cv = S->GetFieldData(cv_key_);
       Epetra_MultiVector& result_v = *result->ViewComponent(*comp,false);
 
       int ncomp = result->size(*comp, false);
-      for (int i=0; i!=ncomp; ++i) {
+      #pragma omp simd
+      for (int i=0; i<ncomp; ++i) {
         result_v[0][i] = model_->DEnergyDBasePorosity(phi_v[0][i], phi0_v[0][i], sl_v[0][i], nl_v[0][i], ul_v[0][i], si_v[0][i], ni_v[0][i], ui_v[0][i], rho_r_v[0][i], ur_v[0][i], cv_v[0][i]);
       }
     }
@@ -228,7 +231,8 @@ Teuchos::RCP<const CompositeVector> cv = S->GetFieldData(cv_key_);
       Epetra_MultiVector& result_v = *result->ViewComponent(*comp,false);
 
       int ncomp = result->size(*comp, false);
-      for (int i=0; i!=ncomp; ++i) {
+      #pragma omp simd
+      for (int i=0; i<ncomp; ++i) {
         result_v[0][i] = model_->DEnergyDSaturationLiquid(phi_v[0][i], phi0_v[0][i], sl_v[0][i], nl_v[0][i], ul_v[0][i], si_v[0][i], ni_v[0][i], ui_v[0][i], rho_r_v[0][i], ur_v[0][i], cv_v[0][i]);
       }
     }
@@ -250,7 +254,8 @@ Teuchos::RCP<const CompositeVector> cv = S->GetFieldData(cv_key_);
       Epetra_MultiVector& result_v = *result->ViewComponent(*comp,false);
 
       int ncomp = result->size(*comp, false);
-      for (int i=0; i!=ncomp; ++i) {
+      #pragma omp simd
+      for (int i=0; i<ncomp; ++i) {
         result_v[0][i] = model_->DEnergyDMolarDensityLiquid(phi_v[0][i], phi0_v[0][i], sl_v[0][i], nl_v[0][i], ul_v[0][i], si_v[0][i], ni_v[0][i], ui_v[0][i], rho_r_v[0][i], ur_v[0][i], cv_v[0][i]);
       }
     }
@@ -272,7 +277,8 @@ Teuchos::RCP<const CompositeVector> cv = S->GetFieldData(cv_key_);
       Epetra_MultiVector& result_v = *result->ViewComponent(*comp,false);
 
       int ncomp = result->size(*comp, false);
-      for (int i=0; i!=ncomp; ++i) {
+      #pragma omp simd
+      for (int i=0; i<ncomp; ++i) {
         result_v[0][i] = model_->DEnergyDInternalEnergyLiquid(phi_v[0][i], phi0_v[0][i], sl_v[0][i], nl_v[0][i], ul_v[0][i], si_v[0][i], ni_v[0][i], ui_v[0][i], rho_r_v[0][i], ur_v[0][i], cv_v[0][i]);
       }
     }
@@ -294,7 +300,8 @@ Teuchos::RCP<const CompositeVector> cv = S->GetFieldData(cv_key_);
       Epetra_MultiVector& result_v = *result->ViewComponent(*comp,false);
 
       int ncomp = result->size(*comp, false);
-      for (int i=0; i!=ncomp; ++i) {
+      #pragma omp simd
+      for (int i=0; i<ncomp; ++i) {
         result_v[0][i] = model_->DEnergyDSaturationIce(phi_v[0][i], phi0_v[0][i], sl_v[0][i], nl_v[0][i], ul_v[0][i], si_v[0][i], ni_v[0][i], ui_v[0][i], rho_r_v[0][i], ur_v[0][i], cv_v[0][i]);
       }
     }
@@ -316,7 +323,8 @@ Teuchos::RCP<const CompositeVector> cv = S->GetFieldData(cv_key_);
       Epetra_MultiVector& result_v = *result->ViewComponent(*comp,false);
 
       int ncomp = result->size(*comp, false);
-      for (int i=0; i!=ncomp; ++i) {
+      #pragma omp simd
+      for (int i=0; i<ncomp; ++i) {
         result_v[0][i] = model_->DEnergyDMolarDensityIce(phi_v[0][i], phi0_v[0][i], sl_v[0][i], nl_v[0][i], ul_v[0][i], si_v[0][i], ni_v[0][i], ui_v[0][i], rho_r_v[0][i], ur_v[0][i], cv_v[0][i]);
       }
     }
@@ -338,7 +346,8 @@ Teuchos::RCP<const CompositeVector> cv = S->GetFieldData(cv_key_);
       Epetra_MultiVector& result_v = *result->ViewComponent(*comp,false);
 
       int ncomp = result->size(*comp, false);
-      for (int i=0; i!=ncomp; ++i) {
+      #pragma omp simd
+      for (int i=0; i<ncomp; ++i) {
         result_v[0][i] = model_->DEnergyDInternalEnergyIce(phi_v[0][i], phi0_v[0][i], sl_v[0][i], nl_v[0][i], ul_v[0][i], si_v[0][i], ni_v[0][i], ui_v[0][i], rho_r_v[0][i], ur_v[0][i], cv_v[0][i]);
       }
     }
@@ -360,7 +369,8 @@ Teuchos::RCP<const CompositeVector> cv = S->GetFieldData(cv_key_);
       Epetra_MultiVector& result_v = *result->ViewComponent(*comp,false);
 
       int ncomp = result->size(*comp, false);
-      for (int i=0; i!=ncomp; ++i) {
+      #pragma omp simd
+      for (int i=0; i<ncomp; ++i) {
         result_v[0][i] = model_->DEnergyDDensityRock(phi_v[0][i], phi0_v[0][i], sl_v[0][i], nl_v[0][i], ul_v[0][i], si_v[0][i], ni_v[0][i], ui_v[0][i], rho_r_v[0][i], ur_v[0][i], cv_v[0][i]);
       }
     }
@@ -382,7 +392,8 @@ Teuchos::RCP<const CompositeVector> cv = S->GetFieldData(cv_key_);
       Epetra_MultiVector& result_v = *result->ViewComponent(*comp,false);
 
       int ncomp = result->size(*comp, false);
-      for (int i=0; i!=ncomp; ++i) {
+      #pragma omp simd
+      for (int i=0; i<ncomp; ++i) {
         result_v[0][i] = model_->DEnergyDInternalEnergyRock(phi_v[0][i], phi0_v[0][i], sl_v[0][i], nl_v[0][i], ul_v[0][i], si_v[0][i], ni_v[0][i], ui_v[0][i], rho_r_v[0][i], ur_v[0][i], cv_v[0][i]);
       }
     }
@@ -404,7 +415,8 @@ Teuchos::RCP<const CompositeVector> cv = S->GetFieldData(cv_key_);
       Epetra_MultiVector& result_v = *result->ViewComponent(*comp,false);
 
       int ncomp = result->size(*comp, false);
-      for (int i=0; i!=ncomp; ++i) {
+      #pragma omp simd
+      for (int i=0; i<ncomp; ++i) {
         result_v[0][i] = model_->DEnergyDCellVolume(phi_v[0][i], phi0_v[0][i], sl_v[0][i], nl_v[0][i], ul_v[0][i], si_v[0][i], ni_v[0][i], ui_v[0][i], rho_r_v[0][i], ur_v[0][i], cv_v[0][i]);
       }
     }
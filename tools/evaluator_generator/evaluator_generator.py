@@ -1,5 +1,4 @@
 import sys,os
-from sympy.printing import ccode
 
 _template_directory = os.path.dirname(os.path.abspath(__file__))
 _templates = {}
@@ -133,22 +132,14 @@ class EvalGen(object):
 
         return "\n\n".join(wrt_list)
                             
-    def renderModelMethodDeclaration(self):
-        return render('model_declaration.hh', dict(myMethod=self.d['myKeyMethod'],
-                                                   myMethodDeclarationArgs=self.d['myMethodDeclarationArgs']))
-
-    def renderModelDerivDeclarations(self):
-        return '\n'.join([render('model_declaration.hh',
-                                 dict(myMethod="D%sD%s"%(self.d['myKeyMethod'],''.join([word[0].upper()+word[1:] for word in arg.split("_")])),
-                                      myMethodDeclarationArgs=self.d['myMethodDeclarationArgs'])) for arg in self.args])
-
     def renderModelMethodImplementation(self):
         if self.expression is not None:
+            # sympy is slow to import, so only do so when there is an expression
+            from sympy.printing import ccode
             implementation = ccode(self.expression)
         else:
             implementation = "ASSERT(False)"
-        return render('model_methodImplementation.cc', dict(evalClassName=self.d['evalClassName'],
-                                                            myMethod=self.d['myKeyMethod'],
+        return render('model_inlineImplementation.hh', dict(myMethod=self.d['myKeyMethod'],
                                                             myMethodDeclarationArgs=self.d['myMethodDeclarationArgs'],
                                                             myMethodImplementation=implementation))
 
@@ -157,13 +148,13 @@ class EvalGen(object):
 
         for arg,var in zip(self.args,self.vars):
             if self.expression is not None:
+                from sympy.printing import ccode
                 print "differentiation of", self.expression, "with respect to", var
                 implementation = ccode(self.expression.diff(var))
             else:
                 implementation = "ASSERT(False)"
-            impls.append(render('model_methodImplementation.cc',
-                                dict(evalClassName=self.d['evalClassName'],
-                                     myMethod="D%sD%s"%(self.d['myKeyMethod'],''.join([word[0].upper()+word[1:] for word in arg.split("_")])),
+            impls.append(render('model_inlineImplementation.hh',
+                                dict(myMethod="D%sD%s"%(self.d['myKeyMethod'],''.join([word[0].upper()+word[1:] for word in arg.split("_")])),
                                      myMethodDeclarationArgs=self.d['myMethodDeclarationArgs'],
                                      myMethodImplementation=implementation)))
         return '\n\n'.join(impls)
@@ -193,8 +184,6 @@ class EvalGen(object):
         self.d['evaluateModel'] = self.renderEvaluateModel()
         self.d['evaluateDerivs'] = self.renderEvaluateDerivs()
 
-        self.d['modelMethodDeclaration'] = self.renderModelMethodDeclaration()
-        self.d['modelDerivDeclarationList'] = self.renderModelDerivDeclarations()
         self.d['paramDeclarationList'] = self.renderModelParamDeclarations()
 
         self.d['modelMethodImplementation'] = self.renderModelMethodImplementation()
@@ -257,8 +246,20 @@ def generate_evaluator(name, namespace, descriptor, my_key, dependencies, parame
 
     files = ["evaluator.hh", "evaluator.cc", "evaluator_reg.hh", "model.hh", "model.cc"]
     for outfile in files:
-        with open(os.path.join(directory, "%s_%s"%(name,outfile)), 'w') as fid:
-            fid.write(render(outfile, eg.d))
+        filename = os.path.join(directory, "%s_%s"%(name,outfile))
+        contents = render(outfile, eg.d)
+
+        # leave files whose contents are unchanged untouched, so that
+        # regenerating does not trigger a rebuild
+        try:
+            with open(filename, 'r') as fid:
+                if fid.read() == contents:
+                    continue
+        except IOError:
+            pass
+
+        with open(filename, 'w') as fid:
+            fid.write(contents)
 
 
       
@@ -4,7 +4,8 @@
     Epetra_MultiVector& result_v = *result->ViewComponent(*comp,false);
 
     int ncomp = result->size(*comp, false);
-    for (int i=0; i!=ncomp; ++i) {{
+    #pragma omp simd
+    for (int i=0; i<ncomp; ++i) {{
       result_v[0][i] = model_->{myKeyMethod}({myMethodArgs});
     }}
   }}
@@ -30,11 +30,6 @@ void
 }}
 
 
-// main method
-{modelMethodImplementation}
-
-{modelDerivImplementationList}
-
 }} //namespace
 }} //namespace
 }} //namespace
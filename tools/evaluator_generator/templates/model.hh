@@ -20,9 +20,11 @@ class {evalClassName}Model {{
   explicit
   {evalClassName}Model(Teuchos::ParameterList& plist);
 
-{modelMethodDeclaration}
+  // Methods are defined inline so that the evaluator's loop over cells
+  // compiles to a single fused pass.
+{modelMethodImplementation}
 
-{modelDerivDeclarationList}
+{modelDerivImplementationList}
   
  protected:
   void InitializeFromPlist_(Teuchos::ParameterList& plist);
@@ -1 +0,0 @@
-  double {myMethod}({myMethodDeclarationArgs}) const;
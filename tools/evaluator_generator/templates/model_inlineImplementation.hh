@@ -0,0 +1,3 @@
+  double {myMethod}({myMethodDeclarationArgs}) const {{
+    return {myMethodImplementation};
+  }}
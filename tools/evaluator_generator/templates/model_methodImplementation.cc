@@ -1,5 +0,0 @@
-double
-{evalClassName}Model::{myMethod}({myMethodDeclarationArgs}) const
-{{
-  return {myMethodImplementation};
-}}
@@ -72,7 +72,8 @@ Teuchos::RCP<const CompositeVector> pres = S->GetFieldData(pres_key_);
     Epetra_MultiVector& result_v = *result->ViewComponent(*comp,false);
 
     int ncomp = result->size(*comp, false);
-    for (int i=0; i!=ncomp; ++i) {
+    #pragma omp simd
+    for (int i=0; i<ncomp; ++i) {
       result_v[0][i] = model_->Density(temp_v[0][i], pres_v[0][i]);
     }
   }
@@ -94,7 +95,8 @@ Teuchos::RCP<const CompositeVector> pres = S->GetFieldData(pres_key_);
       Epetra_MultiVector& result_v = *result->ViewComponent(*comp,false);
 
       int ncomp = result->size(*comp, false);
-      for (int i=0; i!=ncomp; ++i) {
+      #pragma omp simd
+      for (int i=0; i<ncomp; ++i) {
         result_v[0][i] = model_->DDensityDTemperature(temp_v[0][i], pres_v[0][i]);
       }
     }
@@ -107,7 +109,8 @@ Teuchos::RCP<const CompositeVector> pres = S->GetFieldData(pres_key_);
       Epetra_MultiVector& result_v = *result->ViewComponent(*comp,false);
 
       int ncomp = result->size(*comp, false);
-      for (int i=0; i!=ncomp; ++i) {
+      #pragma omp simd
+      for (int i=0; i<ncomp; ++i) {
         result_v[0][i] = model_->DDensityDPressure(temp_v[0][i], pres_v[0][i]);
       }
     }
@@ -31,25 +31,6 @@ EosIdealGasModel::InitializeFromPlist_(Teuchos::ParameterList& plist)
 }
 
 
-// main method
-double
-EosIdealGasModel::Density(double temp, double pres) const
-{
-  return cv_*(-T0_ + temp);
-}
-
-double
-EosIdealGasModel::DDensityDTemperature(double temp, double pres) const
-{
-  return cv_;
-}
-
-double
-EosIdealGasModel::DDensityDPressure(double temp, double pres) const
-{
-  return 0;
-}
-
 } //namespace
 } //namespace
 } //namespace
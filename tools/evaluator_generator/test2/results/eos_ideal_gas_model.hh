@@ -20,10 +20,19 @@ class EosIdealGasModel {
   explicit
   EosIdealGasModel(Teuchos::ParameterList& plist);
 
-  double Density(double temp, double pres) const;
-
-  double DDensityDTemperature(double temp, double pres) const;
-  double DDensityDPressure(double temp, double pres) const;
+  // Methods are defined inline so that the evaluator's loop over cells
+  // compiles to a single fused pass.
+  double Density(double temp, double pres) const {
+    return cv_*(-T0_ + temp);
+  }
+
+  double DDensityDTemperature(double temp, double pres) const {
+    return cv_;
+  }
+
+  double DDensityDPressure(double temp, double pres) const {
+    return 0;
+  }
   
  protected:
   void InitializeFromPlist_(Teuchos::ParameterList& plist);
@@ -1,8 +1,17 @@
 """Functions for parsing Amanzi/ATS XDMF visualization files."""
 import sys,os
+import tempfile
+import concurrent.futures
 import numpy as np
 import h5py
 
+try:
+    # registers compression filters (bitshuffle, lz4, zstd, ...) with h5py, so
+    # vis files written with them can be read
+    import hdf5plugin
+except ImportError:
+    hdf5plugin = None
+
 class VisFile:
     """Class managing the reading of ATS visualization files."""
     def __init__(self, directory='.', domain=None, filename=None, mesh_filename=None, time_unit='yr'):
@@ -56,7 +65,15 @@ class VisFile:
         self.time_factor = time_factor
         self.time_unit = time_unit
         
-        self.d = h5py.File(os.path.join(self.directory, self.filename))
+        # read-only, with a larger chunk cache than h5py's 1MB default so that
+        # chunked vis data with many cycles is not re-read per access
+        self.d = h5py.File(os.path.join(self.directory, self.filename), 'r', libver='latest',
+                           rdcc_nbytes=64*1024*1024, rdcc_nslots=100003)
+        self._vname_cache = dict()
+        self._ds_cache = dict()
+        self._array_cache = dict()
+        self._volume_cache = dict()
+        self._mm = None
         self.loadTimes()
         self.map = None
         
@@ -64,13 +81,33 @@ class VisFile:
         return self
 
     def __exit__(self, exc_type, exc_value, traceback):
+        self._array_cache.clear()
+        self._mm = None
         self.d.close()
 
     def loadTimes(self):
         """(Re-)loads the list of cycles and times."""
-        a_field = next(iter(self.d.keys()))
-        self.cycles = np.array(sorted(self.d[a_field].keys(), key=int))
-        self.times = np.array([self.d[a_field][cycle].attrs['Time'] for cycle in self.cycles]) * self.time_factor
+        # Files written by stack_vis.py store each variable as one
+        # (n_cycles, n_elems) dataset, VNAME_stack, instead of a group of
+        # per-cycle datasets.  Stacks are only used if there are no groups.
+        groups = [k for k, v in self.d.items() if isinstance(v, h5py.Group)]
+        self._stacks = dict()
+        if len(groups) == 0:
+            self._stacks = dict((k[:-len('_stack')], v) for k, v in self.d.items()
+                                if k.endswith('_stack'))
+
+        if len(self._stacks) > 0:
+            stack = next(iter(self._stacks.values()))
+            self._stack_cycles = stack.attrs['cycles']
+            self.cycles = self._stack_cycles.astype(str)
+            self.cycles_int = self._stack_cycles.astype(int)
+            self.times = stack.attrs['times'] * self.time_factor
+        else:
+            a_field = groups[0]
+            self.cycles = np.array(sorted(self.d[a_field].keys(), key=int))
+            self.cycles_int = self.cycles.astype(int)
+            self.times = np.fromiter((self._dataset(a_field, cycle).attrs['Time'] for cycle in self.cycles),
+                                     dtype=float, count=len(self.cycles)) * self.time_factor
 
     def filterIndices(self, indices):
         """Filter based on the index into the current set of cycles.
@@ -86,6 +123,7 @@ class VisFile:
           * slice object : slice the cycle list
         """
         self.cycles = self.cycles[indices]
+        self.cycles_int = self.cycles_int[indices]
         self.times = self.times[indices]
 
         
@@ -100,42 +138,51 @@ class VisFile:
         cycles :
           One of:
           * int : limits to one specific cycle, or the last cycle if -1.
-          * list(int) : a list of specific cycles
+          * list(int) or np.ndarray : a list of specific cycles
         """
-        if type(cycles) is int:
-            cycles = [cycles,]
-
-        # note this would be faster with np.isin, but we care about order and
-        # repetition of cycles here.
-        inds = [np.argwhere(self.cycles == c)[0] for c in cycles]
+        cycles = np.atleast_1d(np.asarray(cycles, dtype=int))
+
+        # -1 refers to the last cycle
+        cycles = np.where(cycles == -1, self.cycles_int[-1], cycles)
+
+        # searchsorted keeps the order and repetition of the requested cycles;
+        # the sorter handles cycles left out of order by a previous filter.
+        sorter = np.argsort(self.cycles_int)
+        pos = np.searchsorted(self.cycles_int, cycles, sorter=sorter)
+        inds = sorter[np.minimum(pos, len(sorter)-1)]
+        missing = self.cycles_int[inds] != cycles
+        if np.any(missing):
+            raise ValueError("Cycle(s) {} not found in vis file.".format(cycles[missing].tolist()))
         self.filterIndices(inds)
 
     def filterTimes(self, times, eps=1.0):
-        """Filter the vis file based on cycles.
+        """Filter the vis file based on times.
 
         Note that filters are applied sequentially, but can be undone by
         calling load_times().
 
         Parameters
         ----------
-        cycles :
-          One of:
-          * int : limits to one specific cycle, or the last cycle if -1.
-          * list(int) : a list of specific cycles
-          * slice object : slice the cycle list
-        times : optional
+        times :
           One of:
           * float : a specific time (within eps in seconds).
           * list(float) : a list of specific times (within eps in seconds).
         eps : float
           Tolerance for defining times, in seconds.  Default is 1.
         """
-        if type(times) is float:
-            times = [times,]
-
-        # note this would be faster with np.isin, but we care about order and
-        # repetition of cycles here.
-        inds = [np.argwhere(np.isclose(self.times, t, eps))[0] for t in times]
+        times = np.atleast_1d(np.asarray(times, dtype=float))
+
+        # find the nearest time, keeping order and repetition of the requested
+        # times, then check it is within eps (converted to time_unit).
+        sorter = np.argsort(self.times)
+        pos = np.minimum(np.searchsorted(self.times, times, sorter=sorter), len(sorter)-1)
+        lower = np.maximum(pos-1, 0)
+        closer = np.abs(self.times[sorter[lower]] - times) < np.abs(self.times[sorter[pos]] - times)
+        inds = sorter[np.where(closer, lower, pos)]
+
+        missing = np.abs(self.times[inds] - times) > eps * self.time_factor / (365.25 * 24 * 3600)
+        if np.any(missing):
+            raise ValueError("Time(s) {} not found in vis file.".format(times[missing].tolist()))
         self.filterIndices(inds)
 
     def variable(self, vname):
@@ -152,16 +199,73 @@ class VisFile:
           Variable name mangled like it is used in Amanzi/ATS.  Something like
           'DOMAIN-vname.cell.0'
         """
-        if self.domain and '-' not in vname:
-            vname = self.domain + '-' + vname
-        if '.' not in vname:
-            vname = vname + '.cell.0'
-        return vname
+        try:
+            return self._vname_cache[vname]
+        except KeyError:
+            pass
+
+        variable_name = vname
+        if self.domain and '-' not in variable_name:
+            variable_name = self.domain + '-' + variable_name
+        if '.' not in variable_name:
+            variable_name = variable_name + '.cell.0'
+        self._vname_cache[vname] = variable_name
+        return variable_name
+
+    def _dataset(self, vname, cycle):
+        """Private access to the h5py Dataset of a fully resolved vname, cached on first use."""
+        key = (vname, cycle)
+        try:
+            return self._ds_cache[key]
+        except KeyError:
+            ds = self.d[vname][cycle]
+            self._ds_cache[key] = ds
+            return ds
+
+    def _array(self, vname, cycle):
+        """Private access to the values of a fully resolved vname, cached on first use.
+
+        Contiguous datasets, the usual vis file layout, are returned as
+        zero-copy, read-only views into a memory map of the file.  Anything
+        else (chunked, filtered, or external storage) is returned as the h5py
+        Dataset.
+        """
+        key = (vname, cycle)
+        try:
+            return self._array_cache[key]
+        except KeyError:
+            pass
+
+        arr = ds = self._dataset(vname, cycle)
+        if ds.chunks is None and ds.external is None:
+            offset = ds.id.get_offset()
+            if offset is not None:
+                if self._mm is None or offset + ds.nbytes > len(self._mm):
+                    # (re-)map, as the file may have grown since it was mapped
+                    self._mm = np.memmap(self.d.filename, mode='r')
+                if offset + ds.nbytes <= len(self._mm):
+                    arr = np.ndarray(ds.shape, dtype=ds.dtype, buffer=self._mm, offset=offset)
+        self._array_cache[key] = arr
+        return arr
+
+    def _stackRows(self, vname, cycles):
+        """Private: rows of vname's stacked dataset holding the given cycles."""
+        cycles = np.asarray(cycles, dtype=int)
+        rows = np.minimum(np.searchsorted(self._stack_cycles, cycles), len(self._stack_cycles)-1)
+        if np.any(self._stack_cycles[rows] != cycles):
+            raise KeyError("Cycle(s) {} not found in {}_stack".format(cycles.tolist(), vname))
+        return rows
 
     def _get(self, vname, cycle):
         """Private get: assumes vname is fully resolved, and does not deal with maps."""
-        return self.d[vname][cycle][:,0]
-    
+        if vname in self._stacks:
+            return self._stacks[vname][self._stackRows(vname, cycle)]
+
+        arr = self._array(vname, cycle)
+        if isinstance(arr, h5py.Dataset):
+            return _readColumn(arr)
+        return arr if arr.ndim == 1 else arr[:,0]
+
     def get(self, vname, cycle):
         """Access a data member.
 
@@ -180,18 +284,23 @@ class VisFile:
         """
         val = self._get(self.variable(vname), cycle)
         if self.map is None:
-            return val
+            # _get may return a read-only view into the file, see _array()
+            return val if val.flags.writeable else np.array(val)
         else:
             return reorder(val, self.map)
         return 
 
-    def getArray(self, vname):
+    def getArray(self, vname, threads=4):
         """Access an array of all cycle values.
 
         Parameters
         ----------
         vname : str
           Base variable name, e.g. 'pressure'
+        threads : int, optional
+          Number of threads used to read cycles concurrently.  Reads from
+          memory-mapped data overlap their I/O; h5py reads are serialized by
+          h5py's lock.  Default is 4, use 1 to read serially.
 
         Returns
         -------
@@ -199,13 +308,94 @@ class VisFile:
           Array of values of shape (n_cycles, n_elems)
         """
         vname = self.variable(vname)
-        val = np.array([self._get(vname, k) for k in self.cycles])
+        if vname in self._stacks:
+            val = self._getStackArray(vname)
+        else:
+            val = self._getCycleArray(vname, threads)
+
         if self.map is None:
             return val
         else:
             return reorder(val, self.map)
+
+    def _getCycleArray(self, vname, threads):
+        """Private getArray for per-cycle datasets."""
+        # resolve all sources up front so that threads only copy data
+        srcs = [self._array(vname, k) for k in self.cycles]
+        if len(srcs) == 0:
+            # no cycles selected, e.g. after filterCycles([])
+            ds = self._dataset(vname, next(iter(self.d[vname].keys())))
+            return np.empty((0, ds.shape[0]), dtype=ds.dtype)
+
+        # read each cycle directly into a preallocated array, avoiding
+        # h5py's per-read allocation and the copy into a stacked array
+        val = np.empty((len(srcs), srcs[0].shape[0]), dtype=srcs[0].dtype)
+        def read(i):
+            if isinstance(srcs[i], h5py.Dataset):
+                _readColumn(srcs[i], out=val[i])
+            else:
+                val[i] = srcs[i] if srcs[i].ndim == 1 else srcs[i][:,0]
+
+        if threads > 1 and len(srcs) > 1:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=threads) as executor:
+                list(executor.map(read, range(len(srcs))))
+        else:
+            for i in range(len(srcs)):
+                read(i)
+        return val
+
+    def _getStackArray(self, vname):
+        """Private getArray for stacked files, reading all cycles in one call."""
+        stack = self._stacks[vname]
+        rows = self._stackRows(vname, self.cycles_int)
+        if len(rows) == stack.shape[0] and np.all(rows == np.arange(len(rows))):
+            val = np.empty(stack.shape, dtype=stack.dtype)
+            stack.read_direct(val)
+        else:
+            # h5py requires increasing, unique indices
+            uniq, inv = np.unique(rows, return_inverse=True)
+            val = stack[uniq][inv]
+        return val
     
-    def loadMesh(self, cycle=None, order=None, shape=None, columnar=False, round=5):
+    def _loadCentroids(self, cycle, round, cache):
+        """Private: mesh element centroids, optionally cached in a sidecar file.
+
+        The sidecar, .MESHNAME_CYCLE_centroids_rROUND.npy next to the mesh
+        file, is used only if it is newer than the mesh file and readable;
+        otherwise centroids are recomputed.
+        """
+        mesh_file = os.path.join(self.directory, self.mesh_filename)
+        sidecar = os.path.join(os.path.dirname(mesh_file), '.{}_{}_centroids_r{}.npy'.format(
+            os.path.splitext(os.path.basename(mesh_file))[0], cycle, round))
+
+        if cache and os.path.isfile(sidecar) and \
+           os.path.getmtime(sidecar) >= os.path.getmtime(mesh_file):
+            try:
+                return np.load(sidecar)
+            except (OSError, ValueError):
+                pass
+
+        centroids = meshElemCentroids(self.directory, self.mesh_filename, cycle, round)
+        if cache:
+            # write to a unique temporary file then rename, so that neither an
+            # interrupted write nor concurrent loads ever leave a bad cache
+            try:
+                fid = tempfile.NamedTemporaryFile(dir=os.path.dirname(sidecar) or '.',
+                                                  suffix='.tmp', delete=False)
+            except OSError:
+                return centroids
+            try:
+                with fid:
+                    np.save(fid, centroids)
+                os.replace(fid.name, sidecar)
+            except OSError:
+                try:
+                    os.remove(fid.name)
+                except OSError:
+                    pass
+        return centroids
+
+    def loadMesh(self, cycle=None, order=None, shape=None, columnar=False, round=5, cache=False):
         """Load and reorder centroids and volumes of mesh.
 
         Parameters
@@ -219,18 +409,34 @@ class VisFile:
           return data in this order.
         round : int
           Decimal places to round centroids to.  Supports sorting.
+        cache : bool, optional
+          If True, element centroids are saved to a hidden .npy file next to
+          the mesh file on first load and read from it on later loads, as
+          long as it is newer than the mesh file.  Default is False.
         """
         if cycle is None:
             cycle = self.cycles[0]
         
-        centroids = meshElemCentroids(self.directory, self.mesh_filename, cycle, round)
+        centroids = self._loadCentroids(cycle, round, cache)
         if order is None and shape is None and not columnar:
             self.map = None
             self.centroids = centroids
         else:
             self.centroids, self.map = structuredOrdering(centroids, order, shape, columnar)
+            self.map = np.ascontiguousarray(self.map, dtype=np.intp)
 
-        self.volume = self.get('cell_volume', cycle)
+        # volumes are cached in file order, so reloading the mesh, e.g. with a
+        # different ordering, does not re-read them
+        try:
+            volume = self._volume_cache[cycle]
+        except KeyError:
+            volume = self._get(self.variable('cell_volume'), cycle)
+            self._volume_cache[cycle] = volume
+
+        if self.map is None:
+            self.volume = np.array(volume)
+        else:
+            self.volume = reorder(volume, self.map)
 
             
     
@@ -240,6 +446,21 @@ elem_type = {5:'QUAD',
              4:'TRIANGLE'
              }
 
+def _readColumn(ds, col=0, out=None):
+    """Reads one column of a 2D h5py Dataset, or all of a 1D one, into a 1D array.
+
+    Uses read_direct so that h5py does not allocate the full 2D array only
+    for it to be sliced.  If out is provided, values are read into it.
+    """
+    if out is None:
+        out = np.empty(ds.shape[0], dtype=ds.dtype)
+    if len(ds.shape) == 1:
+        ds.read_direct(out)
+    else:
+        ds.read_direct(out, source_sel=np.s_[:,col])
+    return out
+
+
 def meshXYZ(directory=".", filename="visdump_mesh.h5", key=None):
     """Reads a mesh nodal coordinates and connectivity.
 
@@ -262,7 +483,8 @@ def meshXYZ(directory=".", filename="visdump_mesh.h5", key=None):
       One of 'QUAD', 'PRISM', 'HEX', or 'TRIANGLE'.  Note 'NSIDED' and 'NFACED' 
       are not yet supported.
     coords : np.ndarray
-      2D nodal coordinate array.  Shape is (n_nodes, dimension).
+      2D nodal coordinate array, indexed by the node ids used in conn.  Shape
+      is (max_node_id + 1, dimension).
     conn : np.ndarray
       2D connection array.  Shape is (n_elem, n_nodes_per_elem + 1), where the
       0th entry in each row is the element type enum, and the remainder of the
@@ -274,7 +496,7 @@ def meshXYZ(directory=".", filename="visdump_mesh.h5", key=None):
             key = next(iter(dat.keys()))
 
         mesh = dat[key]['Mesh']
-        elem_conn = mesh['MixedElements'][:,0]
+        elem_conn = _readColumn(mesh['MixedElements'])
 
         etype = elem_type[elem_conn[0]]
         if (etype == 'PRISM'):
@@ -289,7 +511,15 @@ def meshXYZ(directory=".", filename="visdump_mesh.h5", key=None):
         if len(elem_conn) % (nnodes_per_elem + 1) != 0:
             raise ValueError('This reader only processes single-element-type meshes.')
         n_elems = int(len(elem_conn) / (nnodes_per_elem+1))
-        coords = dict(zip(mesh['NodeMap'][:,0], mesh['Nodes'][:]))
+        node_map = _readColumn(mesh['NodeMap'])
+        nodes_ds = mesh['Nodes']
+        nodes = np.empty(nodes_ds.shape, dtype=nodes_ds.dtype)
+        nodes_ds.read_direct(nodes)
+
+    # dense coordinates indexed by node id, so that coords[conn[:,1:]] gathers
+    # all element coordinates at once
+    coords = np.empty((node_map.max()+1, nodes.shape[1]), dtype=nodes.dtype)
+    coords[node_map] = nodes
 
     conn = elem_conn.reshape((n_elems, nnodes_per_elem+1))
     if (np.any(conn[:,0] != elem_conn[0])):
@@ -324,12 +554,8 @@ def meshElemCentroids(directory=".", filename="visdump_mesh.h5", key=None, round
     """
     etype, coords, conn = meshXYZ(directory, filename, key)
 
-    centroids = np.zeros((len(conn),3),'d')
-    for i,elem in enumerate(conn):
-        elem_coords = np.array([coords[gid] for gid in elem[1:]])
-        elem_z = np.mean(elem_coords, axis=0)
-        centroids[i,:] = elem_z
-    return np.round(centroids, round)
+    centroids = coords[conn[:,1:]].mean(axis=1)
+    return np.round(centroids, round, out=centroids)
     
 
 def structuredOrdering(coordinates, order=None, shape=None, columnar=False):
@@ -410,23 +636,15 @@ def structuredOrdering(coordinates, order=None, shape=None, columnar=False):
     if columnar:
         order = ['x', 'y', 'z',]
     
-    # Surely there is a cleaner way to do this in numpy?
-    # The current approach packs, sorts, and unpacks.
-    if (coordinates.shape[1] == 3):
-        coords_a = np.array([(i,coordinates[i,0],coordinates[i,1],coordinates[i,2])
-                             for i in range(coordinates.shape[0])],
-                            dtype=[('id',int),('x',float),('y',float),('z',float)])
-    elif (coordinates.shape[1] == 2):
-        coords_a = np.array([(i,coordinates[i,0],coordinates[i,1])
-                             for i in range(coordinates.shape[0])],
-                            dtype=[('id',int),('x',float),('y',float)])
-    coords_a.sort(order=order)
-    map = coords_a['id']
-    if (coordinates.shape[1] == 3):
-        ordered_coordinates = np.array([coords_a['x'], coords_a['y'], coords_a['z']]).transpose()
+    # lexsort takes the primary key last and is stable, so ties fall back to
+    # the original element order, as a structured sort on ('id', ...) did.
+    if not order:
+        map = np.arange(coordinates.shape[0])
     else:
-        ordered_coordinates = np.array([coords_a['x'], coords_a['y']]).transpose()
-        
+        columns = {'x':0, 'y':1, 'z':2}
+        map = np.lexsort(tuple(coordinates[:,columns[k]] for k in reversed(order)))
+    ordered_coordinates = coordinates[map]
+
     if columnar:
         # try to guess the shape based on new-found contiguity
         n_cells_in_column = 0
@@ -438,14 +656,14 @@ def structuredOrdering(coordinates, order=None, shape=None, columnar=False):
 
     if shape is not None:
         new_shape = (-1,) + tuple(shape)
-        coord_shape = new_shape+(3,)
+        coord_shape = new_shape+(coordinates.shape[1],)
         ordered_coordinates = np.reshape(ordered_coordinates, coord_shape)
         map = np.reshape(map, new_shape)
 
     return ordered_coordinates, map
 
 
-def reorder(data, map):
+def reorder(data, map, out=None):
     """Re-orders values and arrays according to a mesh reordering.
 
     Parameters
@@ -455,24 +673,17 @@ def reorder(data, map):
     map : np.ndarray
       A reordering of indices to remap the data based on a map
       returned by structuredOrdering()
+    out : np.ndarray, optional
+      If provided, the re-ordered data is written into this array, which
+      must be of shape data.shape[:-1] + map.shape.
 
     Returns
     -------
     data : np.ndarray
-      The re-ordered data.
+      The re-ordered data, of shape data.shape[:-1] + map.shape.
 
     """
-    # one cycle or many?
-    flatten = (len(data.shape) == 1)
-    if flatten:
-        data = np.expand_dims(data, 0)
-
-    # unravel the map, reorder, then reshape back into map's shape
-    map_shape = map.shape
-    data = data[:, map.ravel()].reshape((-1,)+map_shape)
-
-    # if one cycle, get one data
-    if flatten:
-        data = data[0]
-
-    return data
+    # the last axis is always the element axis, for one cycle or many
+    if out is None:
+        return data[..., map]
+    return np.take(data, map, axis=-1, out=out)
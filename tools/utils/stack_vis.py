@@ -0,0 +1,96 @@
+"""Converts an ATS vis file to a stacked layout for faster time-series reads.
+
+ATS writes vis data as one small dataset per cycle, VNAME/CYCLE, of shape
+(n_elems, 1).  Reading a variable across all cycles then costs one HDF5
+read per cycle.  This writes each variable as a single dataset,
+VNAME_stack, of shape (n_cycles, n_elems), chunked along cycles, with
+the cycles and times stored as attributes.  ats_xdmf.VisFile reads either
+layout.
+"""
+
+import sys,os
+import numpy as np
+import h5py
+import argparse
+
+try:
+    import hdf5plugin
+except ImportError:
+    hdf5plugin = None
+
+# Upper bound on the size of a chunk.  This keeps whole chunks within
+# VisFile's 64 MiB chunk cache, so a per-cycle read does not decompress
+# chunk_cycles cycles only to discard them, and within HDF5's 4 GiB limit.
+_CHUNK_BYTES = 4*1024*1024
+
+
+def stackVisFile(infile, outfile, chunk_cycles=64, compression=None):
+    """Writes a stacked copy of a vis file.
+
+    Parameters
+    ----------
+    infile : str
+      Vis file to read, in the per-cycle layout written by ATS.
+    outfile : str
+      File to write, containing one VNAME_stack dataset per variable.
+    chunk_cycles : int, optional
+      Maximum number of cycles per chunk; fewer are used if a chunk would
+      exceed 4 MiB.  Default is 64.
+    compression : str, optional
+      One of None, 'gzip', or 'bitshuffle'.  'bitshuffle' (bitshuffle+lz4,
+      requires the hdf5plugin package) typically shrinks vis data several
+      times over and reads faster than both gzip and uncompressed data.
+      Readers also need hdf5plugin installed.  Default is None.
+    """
+    if compression is None:
+        filter_args = dict()
+    elif compression == 'gzip':
+        filter_args = dict(compression='gzip')
+    elif compression == 'bitshuffle':
+        if hdf5plugin is None:
+            raise ImportError("Compression 'bitshuffle' requires the hdf5plugin package.")
+        filter_args = dict(hdf5plugin.Bitshuffle())
+    else:
+        raise ValueError("Invalid compression '{}': must be one of None, 'gzip', or 'bitshuffle'".format(compression))
+
+    with h5py.File(infile, 'r') as fin, h5py.File(outfile, 'w') as fout:
+        for vname, group in fin.items():
+            cycles = np.array(sorted(group.keys(), key=int))
+            times = np.array([group[c].attrs['Time'] for c in cycles])
+
+            ds0 = group[cycles[0]]
+            n_elems = ds0.shape[0]
+            row_bytes = n_elems * ds0.dtype.itemsize
+            n_chunk = max(1, min(len(cycles), chunk_cycles, _CHUNK_BYTES // row_bytes))
+            # very large meshes also split each cycle across chunks
+            n_chunk_elems = min(n_elems, max(1, _CHUNK_BYTES // ds0.dtype.itemsize))
+            stack = fout.create_dataset(vname+'_stack', shape=(len(cycles), n_elems),
+                                        dtype=ds0.dtype, chunks=(n_chunk, n_chunk_elems),
+                                        **filter_args)
+            stack.attrs['cycles'] = cycles.astype(int)
+            stack.attrs['times'] = times
+
+            # write a whole chunk of cycles at a time
+            buf = np.empty((n_chunk, n_elems), dtype=ds0.dtype)
+            for start in range(0, len(cycles), n_chunk):
+                chunk = cycles[start:start+n_chunk]
+                for i, c in enumerate(chunk):
+                    group[c].read_direct(buf[i], source_sel=np.s_[:,0])
+                stack[start:start+len(chunk)] = buf[:len(chunk)]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert an ATS vis file to one (n_cycles, n_elems) dataset per variable.")
+    parser.add_argument("infile", help="input vis filename, e.g. visdump_data.h5")
+    parser.add_argument("-o", "--outfile", default=None, help="output filename, default is INFILE_stacked.h5")
+    parser.add_argument("--chunk-cycles", dest="chunk_cycles", type=int, default=64, help="number of cycles per chunk")
+    parser.add_argument("--compression", choices=["gzip", "bitshuffle"], default=None,
+                        help="compression filter, bitshuffle requires hdf5plugin")
+    args = parser.parse_args()
+
+    assert args.infile.endswith(".h5")
+    if args.outfile is None:
+        args.outfile = args.infile[:-3]+"_stacked.h5"
+
+    stackVisFile(args.infile, args.outfile, args.chunk_cycles, args.compression)
+    sys.exit(0)